@@ -7,14 +7,26 @@ spells or items with D-pad, preview targeting range, then confirm with A.
 
 from .log import _log
 from .helpers import make_key_event, get_key_for_bind
-from .game_module import KEY_BIND_CONFIRM
+from .game_module import KEY_BIND_CONFIRM, PyGameView
+
+# View capabilities never change at runtime — resolve them once.
+_VIEW_HAS_PLAY_SOUND = hasattr(PyGameView, 'play_sound')
 
 
 # ---------------------------------------------------------------------------
 #  Module-level state
 # ---------------------------------------------------------------------------
-_browse_mode = None    # None | 'spells' | 'items'
-_browse_index = 0      # Current index in the active list
+
+class _BrowseState:
+    """Browse-mode state: the list being browsed and the cursor within it."""
+    __slots__ = ('mode', 'index')
+
+    def __init__(self):
+        self.mode = None    # None | 'spells' | 'items'
+        self.index = 0      # Current index in the active list
+
+
+_state = _BrowseState()
 
 
 # ---------------------------------------------------------------------------
@@ -23,12 +35,14 @@ _browse_index = 0      # Current index in the active list
 
 def _get_browse_list(view):
     """Return the list being browsed (spells or items), or []."""
-    if not view.game or not hasattr(view.game, 'p1'):
+    p1 = getattr(view.game, 'p1', None) if view.game else None
+    if p1 is None:
         return []
-    if _browse_mode == 'spells':
-        return view.game.p1.spells
-    elif _browse_mode == 'items':
-        return view.game.p1.items
+    mode = _state.mode
+    if mode == 'spells':
+        return p1.spells
+    elif mode == 'items':
+        return p1.items
     return []
 
 
@@ -37,10 +51,9 @@ def _browse_select_current(view):
     lst = _get_browse_list(view)
     if not lst:
         return
-    global _browse_index
-    _browse_index = max(0, min(_browse_index, len(lst) - 1))
-    entry = lst[_browse_index]
-    if _browse_mode == 'items':
+    index = _state.index = max(0, min(_state.index, len(lst) - 1))
+    entry = lst[index]
+    if _state.mode == 'items':
         view.choose_spell(entry.spell)
     else:
         view.choose_spell(entry)
@@ -52,54 +65,55 @@ def _browse_select_current(view):
 
 def is_browsing():
     """True if spell/item browse mode is active."""
-    return _browse_mode is not None
+    return _state.mode is not None
+
+
+def get_browse_mode():
+    """The active browse mode: None, 'spells' or 'items'."""
+    return _state.mode
 
 
 def browse_open(view, mode):
     """Enter browse mode for 'spells' or 'items'."""
-    global _browse_mode, _browse_index
-    if not view.game or not hasattr(view.game, 'p1'):
+    p1 = getattr(view.game, 'p1', None) if view.game else None
+    if p1 is None:
         return
-    lst = view.game.p1.spells if mode == 'spells' else view.game.p1.items
+    lst = p1.spells if mode == 'spells' else p1.items
     if not lst:
-        if hasattr(view, 'play_sound'):
+        if _VIEW_HAS_PLAY_SOUND:
             view.play_sound('menu_abort')
         return
-    _browse_mode = mode
-    _browse_index = 0
+    _state.mode = mode
+    _state.index = 0
     _log(f"browse_open({mode}): {len(lst)} entries")
     _browse_select_current(view)
 
 
 def browse_cycle(view, delta):
     """Move the browse index by *delta* (+1 / -1) and preview the selection."""
-    global _browse_index
     lst = _get_browse_list(view)
     if not lst:
         return
-    _browse_index = (_browse_index + delta) % len(lst)
+    _state.index = (_state.index + delta) % len(lst)
     _browse_select_current(view)
 
 
 def browse_confirm(view):
 	"""Confirm the current selection — exit browse mode but keep the spell
 	selected so the user can aim with the stick, then press A to cast."""
-	global _browse_mode
-	_log(f"browse_confirm: {_browse_mode} index {_browse_index}")
-	_browse_mode = None
+	_log(f"browse_confirm: {_state.mode} index {_state.index}")
+	_state.mode = None
 	# Don't inject CONFIRM here — let the user aim the spell first.
 	# The next A press (outside browse mode) will inject CONFIRM and cast.
 
 def browse_cancel(view):
     """Cancel browse mode and abort the previewed spell."""
-    global _browse_mode
-    _log(f"browse_cancel: {_browse_mode}")
-    _browse_mode = None
-    if hasattr(view, 'cur_spell') and view.cur_spell:
+    _log(f"browse_cancel: {_state.mode}")
+    _state.mode = None
+    if getattr(view, 'cur_spell', None):
         view.abort_cur_spell()
 
 
 def clear_browse():
     """Silently reset browse state (used when leaving level state)."""
-    global _browse_mode
-    _browse_mode = None
+    _state.mode = None
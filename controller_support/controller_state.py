@@ -15,8 +15,34 @@ from .config import (
     XboxHats, STICK_DEADZONE, DIRECTION_THRESHOLD, TRIGGER_THRESHOLD,
 )
 
-# How often (seconds) to re-scan for newly connected controllers.
+# Squared radial deadzone — lets _stick_to_digital skip the sqrt.
+_DEADZONE_SQ = STICK_DEADZONE * STICK_DEADZONE
+_NEG_DIRECTION_THRESHOLD = -DIRECTION_THRESHOLD
+
+# TRIGGER_THRESHOLD expressed on the raw -1..1 axis of a trigger that rests
+# at -1: (raw + 1) / 2 > T  ⇔  raw > 2T - 1.
+_TRIGGER_THRESHOLD_MINUS_ONE_REST = 2.0 * TRIGGER_THRESHOLD - 1.0
+
+# Shared (dx, dy) tuples so stick reads don't allocate a new one each poll.
+_DIR_TUPLES = {
+    (dx, dy): (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+}
+_ZERO_DIR = _DIR_TUPLES[0, 0]
+
+# Hot-plug events (pygame 2 / SDL2).  On pygame 1.x these don't exist and
+# poll() falls back to probing the joystick subsystem every frame.
+_JOYDEVICEADDED = getattr(pygame, "JOYDEVICEADDED", None)
+_JOYDEVICEREMOVED = getattr(pygame, "JOYDEVICEREMOVED", None)
+_HAS_DEVICE_EVENTS = _JOYDEVICEREMOVED is not None
+
+# How often (seconds) to re-scan for newly connected controllers.  With
+# device events a scan that finds nothing doubles the wait, up to the cap,
+# since JOYDEVICEADDED resets it anyway.  pygame 1.x has no such event —
+# the re-scan is its only hot-plug detection — so it never backs off.
 _RESCAN_INTERVAL = 2.0
+_MAX_RESCAN_INTERVAL = 30.0 if _HAS_DEVICE_EVENTS else _RESCAN_INTERVAL
+
+_JOYBUTTONDOWN = pygame.JOYBUTTONDOWN
 
 
 class ControllerState:
@@ -31,6 +57,7 @@ class ControllerState:
     def __init__(self):
         self.joystick = None
         self.connected = False
+        self._instance_id = None   # SDL instance id, matched against JOYDEVICEREMOVED
 
         # Auto-detected axis indices (set in try_init)
         self.axis_left_x = 0
@@ -40,13 +67,32 @@ class ControllerState:
         self.axis_lt = -1
         self.axis_rt = -1
         self.trigger_is_minus_one_rest = True
+        self._trigger_cmp = _TRIGGER_THRESHOLD_MINUS_ONE_REST  # raw-axis threshold
+
+        # Device layout, cached at connect time (constant while connected)
+        self._n_buttons = 0
+        self._has_hat = False
+
+        # Whether each mapped axis (pair) exists on the device — resolved in
+        # _auto_detect_axes so poll() needs no per-frame bounds checks
+        self._left_stick_valid = False
+        self._right_stick_valid = False
+        self._lt_valid = False
+        self._rt_valid = False
 
         # Frame deduplication
         self._last_poll_frame = -1
 
-        # Button edge detection
-        self.prev_buttons = {}
-        self.curr_buttons = {}
+        # True after a poll with no new presses and no direction held —
+        # the injectors have nothing to do on such frames
+        self.idle = True
+
+        # Button edge detection — bit N of each mask is button N.  The edge
+        # masks are computed once per poll so queries are a shift-and-test.
+        self.prev_mask = 0
+        self.curr_mask = 0
+        self.pressed_edges = 0
+        self.released_edges = 0
 
         # Trigger states
         self.prev_lt = False
@@ -57,6 +103,9 @@ class ControllerState:
         # D-pad previous state
         self.prev_hat = (0, 0)
         self.curr_hat = (0, 0)
+        # ...and the same in screen coords (down = +y), cached per poll
+        self._prev_dpad_dir = _ZERO_DIR
+        self._curr_dpad_dir = _ZERO_DIR
 
         # Track stick directions as digital
         self.prev_left_dir = (0, 0)
@@ -64,8 +113,12 @@ class ControllerState:
         self.prev_right_dir = (0, 0)
         self.curr_right_dir = (0, 0)
 
-        # Hot-plug: throttle re-scan attempts
-        self._last_scan_time = 0.0
+        # Left stick / d-pad merged (d-pad wins), resolved once per poll
+        self._combined_dir = _ZERO_DIR
+
+        # Hot-plug: throttle re-scan attempts, backing off while nothing's found
+        self._last_scan_time = float("-inf")
+        self._rescan_interval = _RESCAN_INTERVAL
 
     # ------------------------------------------------------------------
     #  Init / auto-detect
@@ -77,14 +130,15 @@ class ControllerState:
         In pygame 1.x, joystick.init() on an already-initialized subsystem
         does NOT re-enumerate devices.  We must quit + re-init to detect
         controllers that were powered on after the game started.
-        Re-scans are throttled to once every few seconds to avoid overhead.
+        Re-scans are throttled to once every few seconds to avoid overhead,
+        backing off exponentially while no controller turns up.
         """
         if self.connected and self.joystick:
             return True
 
         # Throttle: don't re-scan every frame
-        now = time.time()
-        if now - self._last_scan_time < _RESCAN_INTERVAL:
+        now = time.monotonic()
+        if now - self._last_scan_time < self._rescan_interval:
             return False
         self._last_scan_time = now
 
@@ -94,12 +148,16 @@ class ControllerState:
         count = pygame.joystick.get_count()
         if count == 0:
             self.connected = False
+            self._rescan_interval = min(self._rescan_interval * 2, _MAX_RESCAN_INTERVAL)
             return False
 
         try:
             self.joystick = pygame.joystick.Joystick(0)
             self.joystick.init()
             self.connected = True
+            self._rescan_interval = _RESCAN_INTERVAL
+            get_instance_id = getattr(self.joystick, "get_instance_id", None)
+            self._instance_id = get_instance_id() if get_instance_id else None
             name = self.joystick.get_name()
             n_buttons = self.joystick.get_numbuttons()
             n_axes = self.joystick.get_numaxes()
@@ -108,6 +166,9 @@ class ControllerState:
             print(f"[Controller Support]   Buttons: {n_buttons}, Axes: {n_axes}, Hats: {n_hats}")
             _log(f"CONNECTED: {name} | Buttons: {n_buttons}, Axes: {n_axes}, Hats: {n_hats}")
 
+            self._n_buttons = n_buttons
+            self._has_hat = n_hats > XboxHats.DPAD
+
             self._auto_detect_axes(n_axes)
             return True
         except Exception as e:
@@ -149,6 +210,21 @@ class ControllerState:
             self.trigger_is_minus_one_rest = False
             _log("  No trigger axes detected; LT/RT may not work")
 
+        self._left_stick_valid = (
+            self.axis_left_x >= 0 and self.axis_left_y >= 0
+            and max(self.axis_left_x, self.axis_left_y) < n_axes
+        )
+        self._right_stick_valid = (
+            self.axis_right_x >= 0 and self.axis_right_y >= 0
+            and max(self.axis_right_x, self.axis_right_y) < n_axes
+        )
+        self._trigger_cmp = (
+            _TRIGGER_THRESHOLD_MINUS_ONE_REST if self.trigger_is_minus_one_rest
+            else TRIGGER_THRESHOLD
+        )
+        self._lt_valid = 0 <= self.axis_lt < n_axes
+        self._rt_valid = 0 <= self.axis_rt < n_axes
+
         _log(f"  Mapping: LStick({self.axis_left_x},{self.axis_left_y}) "
              f"RStick({self.axis_right_x},{self.axis_right_y}) "
              f"LT({self.axis_lt}) RT({self.axis_rt})")
@@ -161,8 +237,24 @@ class ControllerState:
     #  Per-frame polling
     # ------------------------------------------------------------------
 
-    def poll(self, frameno=0):
-        """Read current controller state. Call once per frame."""
+    def poll(self, frameno=0, events=()):
+        """Read current controller state. Call once per frame.
+
+        *events* is the frame's pygame event list (``view.events``).  The
+        joystick's JOYBUTTONDOWN events are folded into the button snapshot
+        so a tap that is pressed and released between two frames still
+        registers as a press instead of being missed by the polled read.
+
+        This should be the last input read before the view drains
+        ``view.events`` — the patch wrappers call it from inside the
+        process_*_input method they wrap, immediately ahead of the original,
+        so injected events are never a frame behind the hardware.
+
+        Runs on the main thread by design: SDL only refreshes joystick state
+        when the game's own loop pumps events, so polling from a background
+        thread would re-read the same values and race the frame-aligned
+        edge detection below.
+        """
         if not self.connected or not self.joystick:
             return
 
@@ -171,69 +263,86 @@ class ControllerState:
             return
         self._last_poll_frame = frameno
 
-        # Detect mid-session disconnects
-        try:
-            pygame.joystick.init()  # no-op if already init'd
-            if pygame.joystick.get_count() == 0:
+        # Detect mid-session disconnects.  With SDL2 this is driven by
+        # JOYDEVICEREMOVED (see handle_device_events); only pygame 1.x
+        # needs to probe the subsystem every frame.
+        if not _HAS_DEVICE_EVENTS:
+            try:
+                pygame.joystick.init()  # no-op if already init'd
+                if pygame.joystick.get_count() == 0:
+                    self._handle_disconnect()
+                    return
+            except Exception:
                 self._handle_disconnect()
                 return
-        except Exception:
-            self._handle_disconnect()
-            return
 
-        num_axes = self.joystick.get_numaxes()
-
-        # Buttons
-        self.prev_buttons = dict(self.curr_buttons)
-        self.curr_buttons = {
-            i: self.joystick.get_button(i)
-            for i in range(self.joystick.get_numbuttons())
-        }
+        # Bind the joystick methods once — they're hit many times per poll
+        joy = self.joystick
+        get_btn = joy.get_button
+        get_axis = joy.get_axis
+
+        # Buttons → bitmask, then edges
+        mask = 0
+        for i in range(self._n_buttons):
+            if get_btn(i):
+                mask |= 1 << i
+        inst = self._instance_id
+        for e in events:
+            if e.type == _JOYBUTTONDOWN:
+                if inst is None or getattr(e, "instance_id", inst) == inst:
+                    mask |= 1 << e.button
+        prev = self.prev_mask = self.curr_mask
+        self.curr_mask = mask
+        self.pressed_edges = mask & ~prev
+        self.released_edges = prev & ~mask
 
         # Triggers
         self.prev_lt = self.curr_lt
         self.prev_rt = self.curr_rt
-        self.curr_lt = self._read_trigger(self.axis_lt, num_axes)
-        self.curr_rt = self._read_trigger(self.axis_rt, num_axes)
+        self.curr_lt = self._lt_valid and self._read_trigger(get_axis, self.axis_lt)
+        self.curr_rt = self._rt_valid and self._read_trigger(get_axis, self.axis_rt)
 
         # D-pad
         self.prev_hat = self.curr_hat
-        self.curr_hat = (
-            self.joystick.get_hat(XboxHats.DPAD)
-            if self.joystick.get_numhats() > 0
-            else (0, 0)
-        )
+        self.curr_hat = joy.get_hat(XboxHats.DPAD) if self._has_hat else (0, 0)
+        self._prev_dpad_dir = self._curr_dpad_dir
+        hx, hy = self.curr_hat
+        self._curr_dpad_dir = _DIR_TUPLES[hx, -hy]  # SDL hat: up = +1, we want up = -1
 
         # Sticks → digital
         self.prev_left_dir = self.curr_left_dir
         self.prev_right_dir = self.curr_right_dir
-        self.curr_left_dir = self._read_stick(
-            self.axis_left_x, self.axis_left_y, num_axes
+        self.curr_left_dir = (
+            self._read_stick(get_axis, self.axis_left_x, self.axis_left_y)
+            if self._left_stick_valid else _ZERO_DIR
+        )
+        self.curr_right_dir = (
+            self._read_stick(get_axis, self.axis_right_x, self.axis_right_y)
+            if self._right_stick_valid else _ZERO_DIR
         )
-        self.curr_right_dir = self._read_stick(
-            self.axis_right_x, self.axis_right_y, num_axes
+
+        dpad = self._curr_dpad_dir
+        self._combined_dir = dpad if dpad != _ZERO_DIR else self.curr_left_dir
+
+        self.idle = (
+            not self.pressed_edges
+            and not (self.curr_lt and not self.prev_lt)
+            and not (self.curr_rt and not self.prev_rt)
+            and self._combined_dir == _ZERO_DIR
         )
 
     # ------------------------------------------------------------------
     #  Internal helpers
     # ------------------------------------------------------------------
 
-    def _read_trigger(self, axis_idx, num_axes):
-        """Return True if the given trigger axis exceeds the threshold."""
-        if axis_idx < 0 or num_axes <= axis_idx:
-            return False
-        raw = self.joystick.get_axis(axis_idx)
-        val = (raw + 1.0) / 2.0 if self.trigger_is_minus_one_rest else raw
-        return val > TRIGGER_THRESHOLD
-
-    def _read_stick(self, axis_x, axis_y, num_axes):
-        """Read two axes and return a digital (dx, dy) direction."""
-        if axis_x < 0 or axis_y < 0:
-            return (0, 0)
-        if num_axes <= max(axis_x, axis_y):
-            return (0, 0)
-        x = self.joystick.get_axis(axis_x)
-        y = self.joystick.get_axis(axis_y)
+    def _read_trigger(self, get_axis, axis_idx):
+        """Return True if the given (valid) trigger axis exceeds the threshold."""
+        return get_axis(axis_idx) > self._trigger_cmp
+
+    def _read_stick(self, get_axis, axis_x, axis_y):
+        """Read two (valid) axes and return a digital (dx, dy) direction."""
+        x = get_axis(axis_x)
+        y = get_axis(axis_y)
         return self._stick_to_digital(x, y)
 
     @staticmethod
@@ -244,21 +353,12 @@ class ControllerState:
         lower per-axis threshold (DIRECTION_THRESHOLD) so diagonals are
         easier to hit.
         """
-        magnitude = (x * x + y * y) ** 0.5
-        if magnitude < STICK_DEADZONE:
-            return (0, 0)
-
-        dx = 0
-        dy = 0
-        if x > DIRECTION_THRESHOLD:
-            dx = 1
-        elif x < -DIRECTION_THRESHOLD:
-            dx = -1
-        if y > DIRECTION_THRESHOLD:
-            dy = 1   # SDL Y axis: down is positive
-        elif y < -DIRECTION_THRESHOLD:
-            dy = -1
-        return (dx, dy)
+        if x * x + y * y < _DEADZONE_SQ:
+            return _ZERO_DIR
+
+        dx = (x > DIRECTION_THRESHOLD) - (x < _NEG_DIRECTION_THRESHOLD)
+        dy = (y > DIRECTION_THRESHOLD) - (y < _NEG_DIRECTION_THRESHOLD)  # SDL: down is +y
+        return _DIR_TUPLES[dx, dy]
 
     # ------------------------------------------------------------------
     #  Edge-detection queries
@@ -266,15 +366,15 @@ class ControllerState:
 
     def button_just_pressed(self, btn):
         """True on the single frame a button transitions from released → pressed."""
-        return self.curr_buttons.get(btn, False) and not self.prev_buttons.get(btn, False)
+        return (self.pressed_edges >> btn) & 1 == 1
 
     def button_held(self, btn):
         """True while a button is held down."""
-        return self.curr_buttons.get(btn, False)
+        return (self.curr_mask >> btn) & 1 == 1
 
     def button_just_released(self, btn):
         """True on the single frame a button transitions from pressed → released."""
-        return not self.curr_buttons.get(btn, False) and self.prev_buttons.get(btn, False)
+        return (self.released_edges >> btn) & 1 == 1
 
     def lt_just_pressed(self):
         return self.curr_lt and not self.prev_lt
@@ -284,14 +384,12 @@ class ControllerState:
 
     def get_dpad_direction(self):
         """Current d-pad as (dx, dy) in screen coords (down = +y)."""
-        hx, hy = self.curr_hat
-        return (hx, -hy)  # SDL hat: up = +1, we want up = -1
+        return self._curr_dpad_dir
 
     def get_dpad_just_pressed(self):
         """D-pad direction if it just changed to a new non-zero value."""
-        curr = self.get_dpad_direction()
-        prev = (self.prev_hat[0], -self.prev_hat[1])
-        if curr != (0, 0) and curr != prev:
+        curr = self._curr_dpad_dir
+        if curr != _ZERO_DIR and curr != self._prev_dpad_dir:
             return curr
         return None
 
@@ -309,8 +407,7 @@ class ControllerState:
 
     def get_combined_direction(self):
         """Direction from left stick or d-pad (d-pad wins)."""
-        dpad = self.get_dpad_direction()
-        return dpad if dpad != (0, 0) else self.curr_left_dir
+        return self._combined_dir
 
     def get_combined_dir_just_pressed(self):
         """Combined direction if just pressed (edge detection)."""
@@ -318,9 +415,50 @@ class ControllerState:
         return dpad if dpad else self.get_left_dir_just_pressed()
 
     # ------------------------------------------------------------------
-    #  Disconnect handling
+    #  Hot-plug / disconnect handling
     # ------------------------------------------------------------------
 
+    def handle_device_events(self, events):
+        """React to JOYDEVICEADDED / JOYDEVICEREMOVED in the frame's events.
+
+        A removal of our device disconnects immediately; an addition while
+        disconnected lifts the re-scan throttle so try_init() picks it up
+        on the same frame.  An addition while connected re-checks that our
+        joystick is still attached, so a missed removal (or a replug
+        between frames) can't leave us bound to a dead device.  A device
+        yanked between event pumps still surfaces as an exception from
+        poll(), which callers handle.
+        """
+        if not _HAS_DEVICE_EVENTS:
+            return
+        for e in events:
+            etype = e.type
+            if etype == _JOYDEVICEREMOVED:
+                inst = getattr(e, "instance_id", None)
+                if inst is None or self._instance_id is None or inst == self._instance_id:
+                    self._handle_disconnect()
+            elif etype == _JOYDEVICEADDED:
+                if self.connected and self._device_present():
+                    continue
+                if self.connected:
+                    _log("JOYDEVICEADDED: current joystick is gone, re-initializing")
+                    self._handle_disconnect()
+                self._last_scan_time = float("-inf")
+                self._rescan_interval = _RESCAN_INTERVAL
+
+    def _device_present(self):
+        """True if our joystick's instance id is still among attached devices."""
+        inst = self._instance_id
+        if inst is None:
+            return True  # no instance ids on this pygame; can't tell
+        try:
+            for i in range(pygame.joystick.get_count()):
+                if pygame.joystick.Joystick(i).get_instance_id() == inst:
+                    return True
+        except pygame.error:
+            pass
+        return False
+
     def _handle_disconnect(self):
         """Clean up after a controller is unplugged mid-session."""
         if self.connected:
@@ -328,3 +466,6 @@ class ControllerState:
             _log("Controller disconnected mid-session")
         self.connected = False
         self.joystick = None
+        self._instance_id = None
+        self._n_buttons = 0
+        self._has_hat = False
@@ -12,33 +12,59 @@ from .game_module import (
     KEY_BIND_UP_RIGHT, KEY_BIND_UP_LEFT, KEY_BIND_DOWN_RIGHT, KEY_BIND_DOWN_LEFT,
 )
 
-# Direction → KEY_BIND lookup
-_DIR_MAP = {
-    (0, -1):  KEY_BIND_UP,
-    (0,  1):  KEY_BIND_DOWN,
-    (-1, 0):  KEY_BIND_LEFT,
-    (1,  0):  KEY_BIND_RIGHT,
-    (1, -1):  KEY_BIND_UP_RIGHT,
-    (-1, -1): KEY_BIND_UP_LEFT,
-    (1,  1):  KEY_BIND_DOWN_RIGHT,
-    (-1, 1):  KEY_BIND_DOWN_LEFT,
-}
+# Direction → KEY_BIND lookup, a flat 3x3 grid indexed by (dy+1)*3 + (dx+1).
+# The centre slot (neutral direction) stays None.
+_DIR_ARRAY = [None] * 9
+for (_dx, _dy), _bind in (
+    ((0, -1),  KEY_BIND_UP),
+    ((0,  1),  KEY_BIND_DOWN),
+    ((-1, 0),  KEY_BIND_LEFT),
+    ((1,  0),  KEY_BIND_RIGHT),
+    ((1, -1),  KEY_BIND_UP_RIGHT),
+    ((-1, -1), KEY_BIND_UP_LEFT),
+    ((1,  1),  KEY_BIND_DOWN_RIGHT),
+    ((-1, 1),  KEY_BIND_DOWN_LEFT),
+):
+    _DIR_ARRAY[(_dy + 1) * 3 + (_dx + 1)] = _bind
+del _dx, _dy, _bind
+
+
+# (event_type, key) → prebuilt Event.  Injected events are only read by the
+# game's input handlers and then dropped, so one instance per key is shared.
+_EVENT_CACHE = {}
 
 
 def make_key_event(key, event_type=pygame.KEYDOWN):
-    """Create a synthetic pygame keyboard event."""
-    return pygame.event.Event(event_type, key=key)
+    """Return a synthetic pygame keyboard event (shared, don't mutate)."""
+    cache_key = (event_type, key)
+    event = _EVENT_CACHE.get(cache_key)
+    if event is None:
+        event = _EVENT_CACHE[cache_key] = pygame.event.Event(event_type, key=key)
+    return event
 
 
 def direction_to_key_bind(dx, dy):
     """Convert a digital direction (dx, dy) to the appropriate KEY_BIND constant."""
-    return _DIR_MAP.get((dx, dy))
+    return _DIR_ARRAY[(dy + 1) * 3 + (dx + 1)]
+
+
+# KEY_BIND → (bound keys when resolved, resolved pygame key or None).  Each
+# hit re-checks the bound keys against view.key_binds, so a rebind (or a
+# different key_binds dict) is picked up on the next lookup.
+_bind_cache = {}
 
 
 def get_key_for_bind(view, bind):
     """Return the first bound pygame key for a KEY_BIND constant, or None."""
-    keys = view.key_binds.get(bind, [None, None])
-    for k in keys:
+    binds = view.key_binds.get(bind)
+    entry = _bind_cache.get(bind)
+    if entry is not None and entry[0] == binds:
+        return entry[1]
+    key = None
+    for k in binds or ():
         if k is not None:
-            return k
-    return None
+            key = k
+            break
+    # Store a copy so in-place edits of the bind list are still noticed
+    _bind_cache[bind] = (binds[:] if binds is not None else None, key)
+    return key
@@ -41,6 +41,7 @@ from .helpers import make_key_event, direction_to_key_bind, get_key_for_bind
 from .repeater import DirectionRepeater
 from .browse import (
     is_browsing,
+    get_browse_mode,
     browse_open,
     browse_cycle,
     browse_confirm,
@@ -71,18 +72,43 @@ def set_ctrl(ctrl):
 
 
 # ---------------------------------------------------------------------------
-#  Hardcoded direction keys (used by pick_mode, pick_trial, etc.)
+#  Button bits — tested directly against ControllerState's per-poll masks
 # ---------------------------------------------------------------------------
-_HARDCODED_DIR_KEYS = {
-    (0, -1): pygame.K_UP,
-    (0, 1): pygame.K_DOWN,
-    (-1, 0): pygame.K_LEFT,
-    (1, 0): pygame.K_RIGHT,
-    (1, -1): pygame.K_KP9,
-    (-1, -1): pygame.K_KP7,
-    (1, 1): pygame.K_KP3,
-    (-1, 1): pygame.K_KP1,
-}
+_BIT_A = 1 << XboxButtons.A
+_BIT_B = 1 << XboxButtons.B
+_BIT_X = 1 << XboxButtons.X
+_BIT_Y = 1 << XboxButtons.Y
+_BIT_LB = 1 << XboxButtons.LB
+_BIT_RB = 1 << XboxButtons.RB
+_BIT_BACK = 1 << XboxButtons.BACK
+_BIT_START = 1 << XboxButtons.START
+_BIT_L_STICK = 1 << XboxButtons.L_STICK
+_BIT_R_STICK = 1 << XboxButtons.R_STICK
+
+# Buttons whose action is the same KEY_BIND in every key-bind state
+_SIMPLE_BINDS = (
+    (_BIT_B, KEY_BIND_ABORT),
+    (_BIT_X, KEY_BIND_PASS),
+    (_BIT_Y, KEY_BIND_CHAR),
+    (_BIT_START, KEY_BIND_ABORT),
+    (_BIT_BACK, KEY_BIND_HELP),
+)
+
+
+# ---------------------------------------------------------------------------
+#  Direction tables — flat 3x3 grids indexed by (dy+1)*3 + (dx+1)
+# ---------------------------------------------------------------------------
+# KEY_BIND per direction, resolved once at import so the movement loop
+# indexes a list instead of calling direction_to_key_bind() per event.
+_DIR_BINDS = [direction_to_key_bind(i % 3 - 1, i // 3 - 1) for i in range(9)]
+
+# Hardcoded direction keys (used by pick_mode, pick_trial, etc.).
+# Flat 3x3 grid indexed by (dy+1)*3 + (dx+1), same layout as helpers._DIR_ARRAY.
+_HARDCODED_DIR_KEYS = [
+    pygame.K_KP7, pygame.K_UP,   pygame.K_KP9,
+    pygame.K_LEFT, None,         pygame.K_RIGHT,
+    pygame.K_KP1, pygame.K_DOWN, pygame.K_KP3,
+]
 
 
 # ============================================================================
@@ -99,42 +125,57 @@ def inject_controller_events(view):
         return
     view._ctrl_injected_frame = frameno
 
+    _ctrl.handle_device_events(view.events)
     if not _ctrl.connected:
         _ctrl.try_init()
         if not _ctrl.connected:
             return
 
     try:
-        _ctrl.poll(frameno)
+        _ctrl.poll(frameno, view.events)
     except Exception as e:
         _log(f"inject: poll exception: {e}")
         _ctrl._handle_disconnect()
         return
 
+    # Nothing pressed and no direction held: only the repeater needs to
+    # hear about it (to track release for debounce).
+    if _ctrl.idle and not is_browsing() and not is_walk_target_active():
+        left_repeater.update(None)
+        return
+
+    jp = _ctrl.pressed_edges  # buttons that went down this poll
+    combined_dir = _ctrl.get_combined_direction()
     state = view.state
     injected = []
 
+    # Auto-cancel walk-target if we left level state
+    if is_walk_target_active():
+        if state != STATE_LEVEL:
+            walk_target_exit(view, do_walk=False)
+
+    # View attributes consulted by several branches below — read them once.
+    game = view.game
+    in_level = state == STATE_LEVEL and bool(game)
+    cur_spell = getattr(view, "cur_spell", None)
+    deploy_target = getattr(view, "deploy_target", None)
+
     # Auto-cancel browse if we left level or spell got cleared
     if is_browsing():
         if state != STATE_LEVEL:
             clear_browse()
-        elif not (hasattr(view, "cur_spell") and view.cur_spell):
+        elif not cur_spell:
             clear_browse()
 
-    # Auto-cancel walk-target if we left level state
-    if is_walk_target_active():
-        if state != STATE_LEVEL:
-            walk_target_exit(view, do_walk=False)
-
     # ---- WALK-TARGET MODE ----
     if is_walk_target_active():
         # A released → attempt to walk, then exit
-        if not _ctrl.button_held(XboxButtons.A):
+        if not (_ctrl.curr_mask & _BIT_A):
             walk_target_exit(view, do_walk=True)
             return
 
         # B pressed → cancel without walking
-        if _ctrl.button_just_pressed(XboxButtons.B):
+        if jp & _BIT_B:
             walk_target_exit(view, do_walk=False)
             return
 
@@ -144,27 +185,23 @@ def inject_controller_events(view):
 
     # ---- BROWSE MODE ----
     if is_browsing() and state == STATE_LEVEL:
-        if _ctrl.button_just_pressed(XboxButtons.A):
+        if jp & _BIT_A:
             browse_confirm(view)
             return
-        if _ctrl.button_just_pressed(XboxButtons.B):
+        if jp & _BIT_B:
             browse_cancel(view)
             return
-        if _ctrl.button_just_pressed(XboxButtons.RB):
-            from .browse import _browse_mode
-
-            if _browse_mode == "spells":
+        if jp & _BIT_RB:
+            if get_browse_mode() == "spells":
                 browse_cancel(view)
                 return
-        if _ctrl.button_just_pressed(XboxButtons.LB):
-            from .browse import _browse_mode
-
-            if _browse_mode == "items":
+        if jp & _BIT_LB:
+            if get_browse_mode() == "items":
                 browse_cancel(view)
                 return
 
         # D-pad / left stick cycles the list
-        for d in browse_repeater.update(_ctrl.get_combined_direction()):
+        for d in browse_repeater.update(combined_dir):
             dx, dy = d
             if dy < 0:
                 browse_cycle(view, -1)
@@ -175,17 +212,15 @@ def inject_controller_events(view):
 
     # ---- BUTTON PRESSES ----
 
-    if _ctrl.button_just_pressed(XboxButtons.A):
+    if jp & _BIT_A:
         # In STATE_LEVEL with no spell/deploy active → enter walk-target mode
         if (
-            state == STATE_LEVEL
-            and view.game
-            and not (hasattr(view, "cur_spell") and view.cur_spell)
-            and not (hasattr(view, "deploy_target") and view.deploy_target)
+            in_level
+            and not cur_spell
+            and not deploy_target
             and hasattr(view, "can_execute_inputs")
             and view.can_execute_inputs()
-            and hasattr(view.game, "p1")
-            and view.game.p1
+            and getattr(game, "p1", None)
         ):
             walk_target_enter(view)
             return  # skip remaining processing this frame
@@ -194,39 +229,20 @@ def inject_controller_events(view):
             if key:
                 injected.append(make_key_event(key))
 
-    if _ctrl.button_just_pressed(XboxButtons.B):
-        key = get_key_for_bind(view, KEY_BIND_ABORT)
-        if key:
-            injected.append(make_key_event(key))
-
-    if _ctrl.button_just_pressed(XboxButtons.X):
-        key = get_key_for_bind(view, KEY_BIND_PASS)
-        if key:
-            injected.append(make_key_event(key))
-
-    if _ctrl.button_just_pressed(XboxButtons.Y):
-        key = get_key_for_bind(view, KEY_BIND_CHAR)
-        if key:
-            injected.append(make_key_event(key))
-
-    if _ctrl.button_just_pressed(XboxButtons.START):
-        key = get_key_for_bind(view, KEY_BIND_ABORT)
-        if key:
-            injected.append(make_key_event(key))
-
-    if _ctrl.button_just_pressed(XboxButtons.BACK):
-        key = get_key_for_bind(view, KEY_BIND_HELP)
-        if key:
-            injected.append(make_key_event(key))
+    for bit, bind in _SIMPLE_BINDS:
+        if jp & bit:
+            key = get_key_for_bind(view, bind)
+            if key:
+                injected.append(make_key_event(key))
 
     # RB — spell browser or tab-target
-    if _ctrl.button_just_pressed(XboxButtons.RB):
-        if state == STATE_LEVEL and view.game:
-            if hasattr(view, "cur_spell") and view.cur_spell:
+    if jp & _BIT_RB:
+        if in_level:
+            if cur_spell:
                 key = get_key_for_bind(view, KEY_BIND_TAB)
                 if key:
                     injected.append(make_key_event(key))
-            elif not (hasattr(view, "deploy_target") and view.deploy_target):
+            elif not deploy_target:
                 browse_open(view, "spells")
                 return
         else:
@@ -235,11 +251,9 @@ def inject_controller_events(view):
                 injected.append(make_key_event(key))
 
     # LB — item browser or prev examine target
-    if _ctrl.button_just_pressed(XboxButtons.LB):
-        if state == STATE_LEVEL and view.game:
-            if not (hasattr(view, "cur_spell") and view.cur_spell) and not (
-                hasattr(view, "deploy_target") and view.deploy_target
-            ):
+    if jp & _BIT_LB:
+        if in_level:
+            if not cur_spell and not deploy_target:
                 browse_open(view, "items")
                 return
             else:
@@ -252,21 +266,21 @@ def inject_controller_events(view):
                 injected.append(make_key_event(key))
 
     # Stick clicks
-    if _ctrl.button_just_pressed(XboxButtons.L_STICK):
-        if state == STATE_LEVEL and view.game:
+    if jp & _BIT_L_STICK:
+        if in_level:
             key = get_key_for_bind(view, KEY_BIND_AUTOPICKUP)
             if key:
                 injected.append(make_key_event(key))
 
-    if _ctrl.button_just_pressed(XboxButtons.R_STICK):
+    if jp & _BIT_R_STICK:
         key = get_key_for_bind(view, KEY_BIND_THREAT)
         if key:
             injected.append(make_key_event(key))
 
     # Triggers
     if _ctrl.rt_just_pressed():
-        if state == STATE_LEVEL and view.game:
-            if hasattr(view, "cur_spell") and view.cur_spell:
+        if in_level:
+            if cur_spell:
                 key = get_key_for_bind(view, KEY_BIND_CONFIRM)
             else:
                 key = get_key_for_bind(view, KEY_BIND_INTERACT)
@@ -274,15 +288,13 @@ def inject_controller_events(view):
                 injected.append(make_key_event(key))
 
     if _ctrl.lt_just_pressed():
-        if state == STATE_LEVEL and view.game:
+        if in_level:
             key = get_key_for_bind(view, KEY_BIND_REROLL)
             if key:
                 injected.append(make_key_event(key))
 
     # ---- DIRECTIONAL INPUT ----
 
-    combined_dir = _ctrl.get_combined_direction()
-
     # Left stick / D-pad → movement keys.
     # When a spell is active, the game itself redirects movement keys to move
     # the targeting cursor instead of the player, so we always inject normal
@@ -292,8 +304,8 @@ def inject_controller_events(view):
     # for viewport camera scrolling (steam_deck_support mod).  The left stick
     # handles both movement AND spell targeting (the game switches
     # automatically when a spell is selected).
-    for d in left_repeater.update(combined_dir):
-        bind = direction_to_key_bind(*d)
+    for dx, dy in left_repeater.update(combined_dir):
+        bind = _DIR_BINDS[(dy + 1) * 3 + (dx + 1)]
         if bind is not None:
             key = get_key_for_bind(view, bind)
             if key:
@@ -317,29 +329,35 @@ def inject_controller_events_hardcoded(view):
         return
     view._ctrl_injected_frame = frameno
 
+    _ctrl.handle_device_events(view.events)
     if not _ctrl.connected:
         _ctrl.try_init()
         if not _ctrl.connected:
             return
 
     try:
-        _ctrl.poll(frameno)
+        _ctrl.poll(frameno, view.events)
     except Exception as e:
         _log(f"inject_hardcoded: poll exception: {e}")
         _ctrl._handle_disconnect()
         return
 
+    if _ctrl.idle:
+        left_repeater.update(None)
+        return
+
+    jp = _ctrl.pressed_edges  # buttons that went down this poll
     injected = []
 
-    if _ctrl.button_just_pressed(XboxButtons.A):
+    if jp & _BIT_A:
         injected.append(make_key_event(pygame.K_RETURN))
-    if _ctrl.button_just_pressed(XboxButtons.B):
+    if jp & _BIT_B:
         injected.append(make_key_event(pygame.K_ESCAPE))
-    if _ctrl.button_just_pressed(XboxButtons.X):
+    if jp & _BIT_X:
         injected.append(make_key_event(pygame.K_SPACE))
 
-    for d in left_repeater.update(_ctrl.get_combined_direction()):
-        hk = _HARDCODED_DIR_KEYS.get(d)
+    for dx, dy in left_repeater.update(_ctrl.get_combined_direction()):
+        hk = _HARDCODED_DIR_KEYS[(dy + 1) * 3 + (dx + 1)]
         if hk:
             injected.append(make_key_event(hk))
 
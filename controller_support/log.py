@@ -4,22 +4,24 @@ Controller Support — Logging helper.
 Provides a simple file-based logger shared by all modules in the package.
 """
 
+import atexit
 import os
 
 _LOG_PATH = os.path.join(os.path.dirname(__file__), "controller_support.log")
 
-# Start fresh each launch — overwrite any previous log.
+# Start fresh each launch — truncate any previous log.
 try:
-    with open(_LOG_PATH, "w", encoding="utf-8") as _f:
-        pass  # truncate to zero
+    _log_file = open(_LOG_PATH, "w", encoding="utf-8", buffering=1)
+    atexit.register(_log_file.close)
 except Exception:
-    pass
+    _log_file = None
 
 
 def _log(msg):
     """Append a line to the mod log file. Silently ignores write errors."""
+    if _log_file is None:
+        return
     try:
-        with open(_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(str(msg) + "\n")
+        _log_file.write(str(msg) + "\n")
     except Exception:
         pass
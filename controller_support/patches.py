@@ -5,6 +5,10 @@ Three wrapper types:
   _make_wrapper()          — for states driven by key_binds (most of the game)
   _wrap_hardcoded_state()  — for states using raw pygame keys
   _wrap_message_input()    — for message/dialog states (any-key-to-advance)
+
+Every wrapper polls the controller and injects *before* calling the original
+method, i.e. as late as possible: the original consumes self.events on the
+same call, so there's no extra frame of input latency.
 """
 
 import pygame
@@ -17,6 +21,11 @@ from .injection import inject_controller_events, inject_controller_events_hardco
 # The global ControllerState — set by apply_patches().
 _ctrl = None
 
+# Any of these buttons advances a message screen.
+_ADVANCE_MASK = (
+    (1 << XboxButtons.A) | (1 << XboxButtons.B) | (1 << XboxButtons.X)
+)
+
 
 # ============================================================================
 #  Wrapper factories
@@ -48,17 +57,16 @@ def _wrap_message_input(original_method):
         frameno = getattr(self, 'frameno', 0)
         if getattr(self, '_ctrl_injected_frame', -1) != frameno:
             self._ctrl_injected_frame = frameno
+            _ctrl.handle_device_events(self.events)
             if not _ctrl.connected:
                 _ctrl.try_init()
             if _ctrl.connected:
                 try:
-                    _ctrl.poll(frameno)
+                    _ctrl.poll(frameno, self.events)
                 except Exception:
                     _ctrl._handle_disconnect()
                 if _ctrl.connected:
-                    if (_ctrl.button_just_pressed(XboxButtons.A)
-                            or _ctrl.button_just_pressed(XboxButtons.B)
-                            or _ctrl.button_just_pressed(XboxButtons.X)):
+                    if _ctrl.pressed_edges & _ADVANCE_MASK:
                         self.events.append(make_key_event(pygame.K_RETURN))
         return original_method(self, *args, **kwargs)
     wrapper.__name__ = original_method.__name__
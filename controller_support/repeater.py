@@ -6,6 +6,8 @@ import time
 
 from .config import DEBOUNCE_TIME
 
+_DEBOUNCE_NS = int(DEBOUNCE_TIME * 1e9)
+
 
 class DirectionRepeater:
     """Handles initial delay + repeat for a directional input, with debounce.
@@ -13,6 +15,10 @@ class DirectionRepeater:
     Debounce prevents double-inputs caused by:
     - Stick bouncing through neutral for 1–2 frames on a quick tap
     - Jitter between adjacent directions (e.g. right ↔ down-right)
+
+    Delays are given (and exposed) in seconds but tracked internally as
+    integer nanoseconds on the monotonic clock, so wall-clock jumps can't
+    stall it.
     """
 
     def __init__(self, initial_delay, repeat_interval):
@@ -24,10 +30,28 @@ class DirectionRepeater:
         self.last_fire_time = 0
         self.release_time = 0
 
+    @property
+    def initial_delay(self):
+        """Delay before the first repeat, in seconds."""
+        return self._initial_delay_ns / 1e9
+
+    @initial_delay.setter
+    def initial_delay(self, seconds):
+        self._initial_delay_ns = int(seconds * 1e9)
+
+    @property
+    def repeat_interval(self):
+        """Interval between repeats, in seconds."""
+        return self._repeat_interval_ns / 1e9
+
+    @repeat_interval.setter
+    def repeat_interval(self, seconds):
+        self._repeat_interval_ns = int(seconds * 1e9)
+
     def update(self, direction):
         """Feed the current direction each frame. Returns a list of dirs to act on."""
         events = []
-        now = time.time()
+        now = time.monotonic_ns()
 
         if direction is None or direction == (0, 0):
             if self.active_dir is not None:
@@ -37,26 +61,26 @@ class DirectionRepeater:
             return events
 
         # Debounce: don't fire again too soon after the previous event
-        if now - self.last_fire_time < DEBOUNCE_TIME:
+        if now - self.last_fire_time < _DEBOUNCE_NS:
             return events
 
         if direction != self.active_dir:
             # Suppress bounce-back through neutral within debounce window
-            if self.release_time > 0 and (now - self.release_time) < DEBOUNCE_TIME:
+            if self.release_time > 0 and (now - self.release_time) < _DEBOUNCE_NS:
                 self.active_dir = direction
                 self.fired_initial = True
-                self.next_fire_time = now + self.initial_delay
+                self.next_fire_time = now + self._initial_delay_ns
                 return events
 
             # Genuine new direction
             self.active_dir = direction
             self.fired_initial = True
-            self.next_fire_time = now + self.initial_delay
+            self.next_fire_time = now + self._initial_delay_ns
             self.last_fire_time = now
             events.append(direction)
         elif now >= self.next_fire_time:
             # Repeat
-            self.next_fire_time = now + self.repeat_interval
+            self.next_fire_time = now + self._repeat_interval_ns
             self.last_fire_time = now
             events.append(direction)
 
@@ -13,13 +13,32 @@ from .log import _log
 # ---------------------------------------------------------------------------
 #  Module state
 # ---------------------------------------------------------------------------
-_active = False
-_step_spell = None
+class _WalkTargetState:
+    """Walk-target state, mutated in place (no `global` rebinds)."""
+    __slots__ = ('active', 'step_spell')
+
+    def __init__(self):
+        self.active = False
+        self.step_spell = None
+
+
+_state = _WalkTargetState()
+
+
+# Offsets of the 8 neighbouring tiles (the player's own tile is excluded).
+_NEIGHBOURS = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+)
+
+
+def _in_bounds(level, x, y):
+    """Numeric equivalent of level.is_point_in_bounds(Point(x, y))."""
+    return 0 <= x < level.width and 0 <= y < level.height
 
 
 def is_walk_target_active():
     """True while the walk-target overlay is shown."""
-    return _active
+    return _state.active
 
 
 # ---------------------------------------------------------------------------
@@ -66,16 +85,14 @@ class StepSpell:
 
     def get_targetable_tiles(self):
         """All adjacent tiles the player can actually walk to."""
-        cx, cy = self.caster.x, self.caster.y
+        caster = self.caster
+        level = self.level
+        cx, cy = caster.x, caster.y
         tiles = []
-        for dx in (-1, 0, 1):
-            for dy in (-1, 0, 1):
-                if dx == 0 and dy == 0:
-                    continue
-                x, y = cx + dx, cy + dy
-                if self.level.is_point_in_bounds(Point(x, y)):
-                    if self.can_cast(x, y):
-                        tiles.append(Point(x, y))
+        for dx, dy in _NEIGHBOURS:
+            x, y = cx + dx, cy + dy
+            if _in_bounds(level, x, y) and level.can_move(caster, x, y):
+                tiles.append(Point(x, y))
         return tiles
 
     # -- Safety: prevent crashes if the game tries to cast this spell ------
@@ -98,17 +115,15 @@ class StepSpell:
 
 def walk_target_enter(view):
     """Enter walk-target mode: install the StepSpell targeting overlay."""
-    global _active, _step_spell
-
     player = view.game.p1
     level = view.game.cur_level
 
-    _step_spell = StepSpell(player, level)
-    view.cur_spell = _step_spell
+    step_spell = _state.step_spell = StepSpell(player, level)
+    view.cur_spell = step_spell
     view.cur_spell_target = Point(player.x, player.y)
-    view.targetable_tiles = _step_spell.get_targetable_tiles()
+    view.targetable_tiles = step_spell.get_targetable_tiles()
     view.tab_targets = []
-    _active = True
+    _state.active = True
     _log("walk_target: entered")
 
 
@@ -119,11 +134,11 @@ def walk_target_update(view, ctrl):
     When the stick returns to neutral, the cursor stays at the last aimed
     position so the player can see the green/red feedback and decide.
     """
-    if not _active or not _step_spell:
+    if not _state.active or not _state.step_spell:
         return
 
     # Safety: if something else cleared our spell, bail out
-    if view.cur_spell is not _step_spell:
+    if view.cur_spell is not _state.step_spell:
         _force_cleanup()
         return
 
@@ -133,8 +148,9 @@ def walk_target_update(view, ctrl):
 
     player = view.game.p1
     dx, dy = direction
-    target = Point(player.x + dx, player.y + dy)
-    if view.game.cur_level.is_point_in_bounds(target):
+    x, y = player.x + dx, player.y + dy
+    if _in_bounds(view.game.cur_level, x, y):
+        target = Point(x, y)
         view.cur_spell_target = target
         view.try_examine_tile(target)
 
@@ -145,15 +161,13 @@ def walk_target_exit(view, do_walk=False):
     If *do_walk* and the target is valid, call ``view.try_move()`` directly
     to execute the step.  Returns True if a move was executed.
     """
-    global _active, _step_spell
-
     moved = False
-    if do_walk and _step_spell and view.cur_spell_target:
+    if do_walk and _state.step_spell and view.cur_spell_target:
         player = view.game.p1
         dx = view.cur_spell_target.x - player.x
         dy = view.cur_spell_target.y - player.y
 
-        can_walk = (dx != 0 or dy != 0) and _step_spell.can_cast(
+        can_walk = (dx != 0 or dy != 0) and _state.step_spell.can_cast(
             view.cur_spell_target.x, view.cur_spell_target.y
         )
 
@@ -162,8 +176,8 @@ def walk_target_exit(view, do_walk=False):
         view.cur_spell = None
         view.cur_spell_target = None
         view.targetable_tiles = None
-        _step_spell = None
-        _active = False
+        _state.step_spell = None
+        _state.active = False
 
         if can_walk:
             moved = view.try_move(Point(dx, dy))
@@ -179,8 +193,8 @@ def walk_target_exit(view, do_walk=False):
         view.cur_spell = None
         view.cur_spell_target = None
         view.targetable_tiles = None
-        _step_spell = None
-        _active = False
+        _state.step_spell = None
+        _state.active = False
         if do_walk:
             view.play_sound("menu_abort")
         _log("walk_target: exit cancelled")
@@ -190,6 +204,5 @@ def walk_target_exit(view, do_walk=False):
 
 def _force_cleanup():
     """Reset internal state if the spell was removed externally."""
-    global _active, _step_spell
-    _step_spell = None
-    _active = False
+    _state.step_spell = None
+    _state.active = False
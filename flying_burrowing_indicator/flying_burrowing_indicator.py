@@ -12,13 +12,21 @@
 #
 # Logs to mods/flying_burrowing_indicator/flying_burrowing_indicator.log
 
-import sys, os
+import atexit, sys, os
 
 LOG_PATH = os.path.join(os.path.dirname(__file__), "flying_burrowing_indicator.log")
+
+try:
+    _log_file = open(LOG_PATH, "a", encoding="utf-8", buffering=1)
+    atexit.register(_log_file.close)
+except Exception:
+    _log_file = None
+
 def _log(msg):
+    if _log_file is None:
+        return
     try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(msg + "\n")
+        _log_file.write(msg + "\n")
     except Exception:
         pass
 
@@ -35,6 +43,14 @@ if PyGameView is None:
     _log("flying_burrowing_indicator: ERROR: PyGameView not found")
     raise RuntimeError("PyGameView not found; game version mismatch?")
 
+from Level import (BUFF_TYPE_BLESS, BUFF_TYPE_CURSE, BUFF_TYPE_PASSIVE, Tags, Stun,
+                   ITEM_SLOT_STAFF, ITEM_SLOT_ROBE, ITEM_SLOT_HEAD, ITEM_SLOT_GLOVES, ITEM_SLOT_BOOTS)
+
+SPRITE_SIZE = getattr(game, 'SPRITE_SIZE', 16)
+
+_STATUS_BUFF_TYPES = (BUFF_TYPE_BLESS, BUFF_TYPE_CURSE)
+_EQUIPMENT_SLOTS = (ITEM_SLOT_STAFF, ITEM_SLOT_ROBE, ITEM_SLOT_HEAD, ITEM_SLOT_GLOVES, ITEM_SLOT_BOOTS)
+
 # ---------- monkey-patch draw_character ----------
 
 _original_draw_character = PyGameView.draw_character
@@ -57,9 +73,6 @@ def _patched_draw_character(self):
     if not p1.flying and not p1.burrowing:
         return
 
-    from Level import BUFF_TYPE_BLESS, BUFF_TYPE_CURSE, BUFF_TYPE_PASSIVE, Tags, Stun
-    SPRITE_SIZE = getattr(game, 'SPRITE_SIZE', 16)
-
     # --- Recompute cur_y by mirroring the original draw_character layout ---
     cur_x = self.border_margin
     cur_y = self.border_margin
@@ -97,34 +110,29 @@ def _patched_draw_character(self):
     cur_y += linesize * len(p1.items)
 
     # Buffs section
-    status_effects = [b for b in p1.buffs if b.buff_type in [BUFF_TYPE_BLESS, BUFF_TYPE_CURSE]]
-    if status_effects:
-        counts = {}
-        for effect in status_effects:
-            if effect.name not in counts:
-                counts[effect.name] = effect
+    status_names = {b.name for b in p1.buffs if b.buff_type in _STATUS_BUFF_TYPES}
+    if status_names:
         cur_y += linesize  # blank line
         cur_y += linesize  # "Status Effects:" header
-        cur_y += linesize * len(counts)  # each unique buff
+        cur_y += linesize * len(status_names)  # each unique buff
 
     # Equipment section
     if p1.equipment or p1.trinkets:
         cur_y += linesize  # blank line
         cur_y += linesize  # "Equipment:" header
 
-        from Level import ITEM_SLOT_STAFF, ITEM_SLOT_ROBE, ITEM_SLOT_HEAD, ITEM_SLOT_GLOVES, ITEM_SLOT_BOOTS
-        item_list = []
-        for slot in [ITEM_SLOT_STAFF, ITEM_SLOT_ROBE, ITEM_SLOT_HEAD, ITEM_SLOT_GLOVES, ITEM_SLOT_BOOTS]:
-            item = p1.equipment.get(slot)
-            if item:
-                item_list.append(item)
-        item_list.extend(p1.trinkets)
+        equipment = p1.equipment
+        n_items = len(p1.trinkets)
+        for slot in _EQUIPMENT_SLOTS:
+            if equipment.get(slot):
+                n_items += 1
 
         # Equipment icons laid out horizontally, wrapping
+        wrap_x = self.character_display.get_width() - self.border_margin - SPRITE_SIZE
         eq_x = self.border_margin
-        for item in item_list:
+        for _ in range(n_items):
             eq_x += SPRITE_SIZE + 2
-            if eq_x > self.character_display.get_width() - self.border_margin - SPRITE_SIZE:
+            if eq_x > wrap_x:
                 eq_x = self.border_margin
                 cur_y += linesize
 
@@ -136,30 +144,35 @@ def _patched_draw_character(self):
         cur_y += linesize  # blank line
         cur_y += linesize  # "Skills:" header
 
+        wrap_x = self.character_display.get_width() - self.border_margin - SPRITE_SIZE
         skill_x = self.border_margin
-        for skill in skills:
+        for _ in skills:
             skill_x += SPRITE_SIZE + 2
-            if skill_x > self.character_display.get_width() - self.border_margin - SPRITE_SIZE:
+            if skill_x > wrap_x:
                 skill_x = self.border_margin
                 cur_y += linesize
 
         cur_y += linesize  # after skills row
 
     # Resistances section
-    resist_tags = [t for t in Tags if t in p1.resists and p1.resists[t] != 0]
-    resist_tags.sort(key=lambda t: -p1.resists[t])
+    # Only the line count matters here, so the original's sort is skipped:
+    # one line per non-zero resist, plus a spacer after each non-empty
+    # group (positive, then negative)
+    resists = p1.resists
+    n_positive = n_negative = 0
+    for tag in Tags:
+        if tag in resists:
+            amount = resists[tag]
+            if amount > 0:
+                n_positive += 1
+            elif amount < 0:
+                n_negative += 1
 
     cur_y += linesize  # blank line before resists
-    for negative in [False, True]:
-        has_resists = False
-        for tag in resist_tags:
-            if not ((p1.resists[tag] < 0) == negative):
-                continue
-            has_resists = True
-            cur_y += linesize
-
-        if has_resists:
-            cur_y += linesize
+    if n_positive:
+        cur_y += linesize * (n_positive + 1)
+    if n_negative:
+        cur_y += linesize * (n_negative + 1)
 
     # Stun line (conditional)
     stunbuff = p1.get_buff(Stun)
@@ -10,13 +10,22 @@
 #   that’s on you :)
 
 
+import atexit
 import os
 
 LOG_PATH = os.path.join(os.path.dirname(__file__), "no_pet.log")
+
+try:
+    _log_file = open(LOG_PATH, "a", encoding="utf-8", buffering=1)
+    atexit.register(_log_file.close)
+except Exception:
+    _log_file = None
+
 def _log(msg):
+    if _log_file is None:
+        return
     try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(msg + "\n")
+        _log_file.write(msg + "\n")
     except Exception:
         pass
 
@@ -36,7 +45,7 @@ for name in ("exotic_pet_chest", "crown_chest"):  # crown_chest == Sigil Chest i
     if callable(fn):
         targets.append(fn)
         _log(f"no_pet: will remove entries for {name}")
-targets = tuple(targets)
+targets = frozenset(targets)
 
 def _is_table(obj):
     if not isinstance(obj, (list, tuple)) or not obj:
@@ -51,15 +60,6 @@ def _filter_table(table, label):
     _log(f"no_pet: filtered {label}: {before} -> {after}")
     return filtered
 
-# Filter any static tables on Shrines (covers RW2’s portal reward table)
-for attr_name, attr_val in list(vars(Shrines).items()):
-    if _is_table(attr_val):
-        try:
-            setattr(Shrines, attr_name, _filter_table(attr_val, attr_name))
-        except Exception as e:
-            _log(f"no_pet: skip {attr_name}: {e!r}")
-
-# Optional: wrap factory functions that might build tables dynamically
 def _wrap_factory(fn):
     if not callable(fn) or getattr(fn, "_no_pet_wrapped", False):
         return fn
@@ -71,8 +71,16 @@ def _wrap_factory(fn):
     wrapped._no_pet_wrapped = True
     return wrapped
 
+# One pass over Shrines: filter any static tables (covers RW2’s portal
+# reward table) and wrap factory functions that might build tables
+# dynamically.  Tables are never callable, so the branches don't overlap.
 for name, val in list(vars(Shrines).items()):
-    if callable(val) and name.lower().startswith(("roll_", "build_", "get_", "make_")):
+    if _is_table(val):
+        try:
+            setattr(Shrines, name, _filter_table(val, name))
+        except Exception as e:
+            _log(f"no_pet: skip {name}: {e!r}")
+    elif callable(val) and name.lower().startswith(("roll_", "build_", "get_", "make_")):
         try:
             setattr(Shrines, name, _wrap_factory(val))
             _log(f"no_pet: wrapped factory {name}")
@@ -36,23 +36,35 @@
 #     FIX: cache the "has_enemies" check once per turn.
 #
 #  8. EventHandler.raise_event copies handler list every call (list(...)).
-#     FIX: only copy when the list has actually been mutated.
+#     KEPT: the copy is intentional – it protects dispatch from handlers
+#     that register or unregister mid-event.  Only the lookups are trimmed.
 #
 # All patches are done via monkey-patching so the original files are untouched.
 # Disable this mod by renaming to performance_boost.py.disabled
 # -------------------------------------------------------------------------
 
+import atexit
 import sys
 import os
+import itertools
+from collections import OrderedDict
 import math
-import time
+import random
+import weakref
 
 LOG_PATH = os.path.join(os.path.dirname(__file__), "performance_boost.log")
 
+try:
+    _log_file = open(LOG_PATH, "a", encoding="utf-8", buffering=1)
+    atexit.register(_log_file.close)
+except Exception:
+    _log_file = None
+
 def _log(msg):
+    if _log_file is None:
+        return
     try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(msg + "\n")
+        _log_file.write(msg + "\n")
     except Exception:
         pass
 
@@ -67,6 +79,58 @@ try:
 except ImportError:
     import libtcodpy as libtcod
 
+# =========================================================================
+# Frame counter shared by the per-frame caches below
+# =========================================================================
+# The caches used to key on (turn_no, frame_start_time), but frame_start_time
+# is a time.time() float that can repeat across two quick frames on coarse
+# clocks.  Instead we wrap iter_frame so every resume of a level's frame
+# generator takes a fresh, globally unique frame number.  Levels whose
+# generator predates this mod have no entry and fall back to the old key.
+# =========================================================================
+
+_frame_numbers = itertools.count(1)
+_frame_ids = {}  # id(level) -> number of the frame that level is running
+
+_orig_iter_frame = Level.Level.iter_frame
+
+def _counting_iter_frame(self, *args, **kwargs):
+    # Hand-expanded `yield from`: send(), throw() and close() all reach the
+    # original generator unchanged, but we get to take a new frame number
+    # before each resume.
+    level_id = id(self)
+    gen = _orig_iter_frame(self, *args, **kwargs)
+    try:
+        _frame_ids[level_id] = next(_frame_numbers)
+        try:
+            val = next(gen)
+        except StopIteration as e:
+            return e.value
+        while True:
+            try:
+                sent = yield val
+            except GeneratorExit:
+                gen.close()
+                raise
+            except BaseException as exc:
+                _frame_ids[level_id] = next(_frame_numbers)
+                try:
+                    val = gen.throw(exc)
+                except StopIteration as e:
+                    return e.value
+            else:
+                _frame_ids[level_id] = next(_frame_numbers)
+                try:
+                    val = gen.send(sent)
+                except StopIteration as e:
+                    return e.value
+    finally:
+        _frame_ids.pop(level_id, None)
+
+_log("performance_boost: wrapping Level.iter_frame  (frame counter)")
+Level.Level.iter_frame = _counting_iter_frame
+
+
 # =========================================================================
 # PATCH 1 – Cached FOV for can_see()
 # =========================================================================
@@ -74,89 +138,167 @@ except ImportError:
 # invocation (once from each endpoint to force symmetry).  FOV is the most
 # expensive single call in the entire game – it flood-fills the whole map.
 #
-# We cache the FOV result bitmap keyed on (origin_x, origin_y).  The cache
-# is invalidated every time Level.advance() is called (i.e. once per game
-# frame), which is correct because walls don't change mid-frame.
+# We cache the FOV result bitmap keyed on (origin_x, origin_y) and the
+# level's terrain version.  The cache is dropped every time Level.advance()
+# is called (i.e. once per game frame); terrain edits within a frame bump
+# the version instead, so only origins queried afterwards are recomputed.
+# Within a frame the cache is an LRU capped at _FOV_CACHE_SIZE origins, so
+# big fights with many distinct viewpoints can't grow it without bound.
 # =========================================================================
 
-_fov_cache = {}
-_fov_cache_turn = -1
+# Each entry is a ~1KB bitmap, so this caps the cache at a few hundred KB
+# while still holding every viewpoint of a typical frame.
+_FOV_CACHE_SIZE = 256
 
-def _invalidate_fov_cache():
-    """Clear the FOV cache.  Called when terrain changes mid-turn."""
-    global _fov_cache, _fov_cache_turn
-    _fov_cache = {}
-    _fov_cache_turn = -1
+_fov_cache = OrderedDict()
+_fov_cache_turn = -1
 
-def _get_fov_set(level, ox, oy):
-    """Return a frozenset of (x,y) tiles visible from (ox, oy), cached."""
+# id(level) -> terrain version, bumped by the terrain-change hooks below and
+# part of every FOV cache key.  Kept here rather than on the level so it
+# never ends up in save files; entries are dropped when their level dies.
+_terrain_versions = {}
+
+def _bump_terrain_version(level):
+    level_id = id(level)
+    version = _terrain_versions.get(level_id)
+    if version is None:
+        try:
+            weakref.finalize(level, _terrain_versions.pop, level_id, None)
+        except TypeError:
+            pass  # not weak-referenceable; the entry just outlives the level
+        version = 0
+    _terrain_versions[level_id] = version + 1
+
+# FOV algorithms whose result is symmetric by construction, so a single
+# lookup from either endpoint already answers can_see().  Everything else
+# keeps the second, reverse lookup the original does.
+_SYMMETRIC_FOV_ALGOS = frozenset(
+    algo for algo in (getattr(libtcod, 'FOV_SYMMETRIC_SHADOWCAST', None),)
+    if algo is not None
+)
+
+# Short-range queries don't need a full radius-40 flood.  Each bucket is
+# (radius, largest squared distance it answers); the one-tile margin keeps
+# us clear of libtcod's edge-of-radius rounding.  Anything further out uses
+# the original radius of 40, whose entry answers every query.
+_FOV_RADIUS_BUCKETS = ((10, 9 * 9), (20, 19 * 19))
+_FOV_FULL_RADIUS = (40, float('inf'))
+
+# FOV_BASIC casts rays to the edge of the radius, so a smaller radius can
+# change which inner tiles are lit.  It always gets the full radius.
+_RADIUS_DEPENDENT_FOV_ALGOS = frozenset(
+    algo for algo in (getattr(libtcod, 'FOV_BASIC', None),)
+    if algo is not None
+)
+
+def _get_fov_set(level, ox, oy, dist_sq):
+    """Return the tiles visible from (ox, oy) as a flat bytes bitmap, cached.
+
+    The bitmap holds one byte per tile in row-major order, so (x, y) is
+    visible iff ``bitmap[y * level.width + x]`` is non-zero.  It is only
+    guaranteed complete out to squared distance ``dist_sq`` from the origin.
+    """
     global _fov_cache, _fov_cache_turn
-    # Invalidate whenever the frame changes (new advance call)
-    # Also invalidated explicitly by terrain-change hooks below
-    level_turn = (id(level), getattr(level, 'turn_no', 0), getattr(level, 'frame_start_time', 0))
+    # Invalidate whenever the frame changes (new advance call).  Terrain
+    # changes mid-frame are handled by the version in the key.
+    level_turn = _frame_ids.get(id(level))
+    if level_turn is None:
+        level_turn = (id(level), getattr(level, 'turn_no', 0), getattr(level, 'frame_start_time', 0))
     if level_turn != _fov_cache_turn:
-        _fov_cache = {}
+        _fov_cache = OrderedDict()
         _fov_cache_turn = level_turn
-    key = (ox, oy)
-    if key in _fov_cache:
-        return _fov_cache[key]
-    if not hasattr(level, 'tcod_map') or not level.tcod_map:
+    key = (ox, oy, _terrain_versions.get(id(level), 0))
+    entry = _fov_cache.get(key)
+    if entry is not None and entry[0] >= dist_sq:
+        _fov_cache.move_to_end(key)
+        return entry[1]
+    radius, reach_sq = _FOV_FULL_RADIUS
+    if level.fov not in _RADIUS_DEPENDENT_FOV_ALGOS:
+        for bucket in _FOV_RADIUS_BUCKETS:
+            if dist_sq <= bucket[1]:
+                radius, reach_sq = bucket
+                break
+    if not getattr(level, 'tcod_map', None):
         level.make_map()
-    libtcod.map_compute_fov(level.tcod_map, ox, oy, radius=40, light_walls=False, algo=level.fov)
-    # Read out the fov into a Python set for O(1) lookups
-    visible = set()
-    tiles = level.tiles
-    w = level.width
-    h = level.height
-    for x in range(w):
-        col = tiles[x]
-        for y in range(h):
-            if libtcod.map_is_in_fov(level.tcod_map, x, y):
-                visible.add((x, y))
-    result = frozenset(visible)
-    _fov_cache[key] = result
+    tcod_map = level.tcod_map
+    libtcod.map_compute_fov(tcod_map, ox, oy, radius=radius, light_walls=False, algo=level.fov)
+    # Copy the fov out into a dense bitmap – a byte per tile is ~50x smaller
+    # than a set of tuples and indexing it needs no hashing.  Modern tcod
+    # maps expose the FOV buffer as a numpy bool array, so take it in one
+    # bulk copy instead of w*h map_is_in_fov() calls.
+    fov = getattr(tcod_map, 'fov', None)
+    if fov is not None:
+        # Kept as bytes rather than the ndarray: indexing bytes from Python
+        # is cheaper than numpy scalar indexing, and the fallback below can
+        # build the same buffer.  tobytes() in the array's own order puts x
+        # on the fast axis.
+        result = fov.tobytes(getattr(tcod_map, '_order', 'C'))
+    else:
+        # Old libtcodpy without the array view – fall back to per-tile reads
+        is_in_fov = libtcod.map_is_in_fov
+        w = level.width
+        visible = bytearray(w * level.height)
+        for y in range(level.height):
+            row = y * w
+            for x in range(w):
+                if is_in_fov(tcod_map, x, y):
+                    visible[row + x] = 1
+        result = bytes(visible)
+    # A wider recompute replaces the narrower entry for this origin
+    _fov_cache[key] = (reach_sq, result)
+    _fov_cache.move_to_end(key)
+    if len(_fov_cache) > _FOV_CACHE_SIZE:
+        _fov_cache.popitem(last=False)
     return result
 
 
 def _fast_can_see(self, x1, y1, x2, y2, light_walls=False):
-    if not hasattr(self, 'tcod_map') or not self.tcod_map:
+    if not getattr(self, 'tcod_map', None):
         self.make_map()
     tiles = self.tiles
     if not light_walls and (not tiles[x1][y1].can_see or not tiles[x2][y2].can_see):
         return False
-    fov1 = _get_fov_set(self, x1, y1)
-    if (x2, y2) in fov1:
+    w = self.width
+    dx = x2 - x1
+    dy = y2 - y1
+    dist_sq = dx * dx + dy * dy
+    fov1 = _get_fov_set(self, x1, y1, dist_sq)
+    if fov1[y2 * w + x2]:
         return True
+    if self.fov in _SYMMETRIC_FOV_ALGOS:
+        return False
     # Symmetry check
-    fov2 = _get_fov_set(self, x2, y2)
-    return (x1, y1) in fov2
+    fov2 = _get_fov_set(self, x2, y2, dist_sq)
+    return bool(fov2[y1 * w + x1])
 
 
 _log("performance_boost: patching Level.can_see  (FOV cache)")
 Level.Level.can_see = _fast_can_see
 
-# Hook terrain-change methods to invalidate FOV cache when walls are
-# created or destroyed mid-turn (e.g. by spells like Earthquake, Dig, etc.)
+# Hook terrain-change methods to bump the level's terrain version when walls
+# are created or destroyed mid-turn (e.g. by spells like Earthquake, Dig,
+# etc.)  Edits to other levels, such as ones still being generated, no
+# longer throw away the current level's cached FOVs.
 _orig_make_wall = Level.Level.make_wall
 _orig_make_floor = Level.Level.make_floor
 _orig_make_chasm = Level.Level.make_chasm
 
 def _hooked_make_wall(self, x, y, calc_glyph=True):
-    _invalidate_fov_cache()
+    _bump_terrain_version(self)
     return _orig_make_wall(self, x, y, calc_glyph)
 
 def _hooked_make_floor(self, x, y, calc_glyph=True):
-    _invalidate_fov_cache()
+    _bump_terrain_version(self)
     return _orig_make_floor(self, x, y, calc_glyph)
 
 def _hooked_make_chasm(self, x, y, calc_glyph=True):
-    _invalidate_fov_cache()
+    _bump_terrain_version(self)
     return _orig_make_chasm(self, x, y, calc_glyph)
 
 Level.Level.make_wall = _hooked_make_wall
 Level.Level.make_floor = _hooked_make_floor
 Level.Level.make_chasm = _hooked_make_chasm
-_log("performance_boost: hooking make_wall/make_floor/make_chasm  (FOV cache invalidation)")
+_log("performance_boost: hooking make_wall/make_floor/make_chasm  (FOV terrain version)")
 
 
 # =========================================================================
@@ -169,7 +311,8 @@ _log("performance_boost: hooking make_wall/make_floor/make_chasm  (FOV cache inv
 
 _sqrt = math.sqrt
 
-def _fast_distance(p1, p2, diag=False, euclidean=True):
+# Underscore default args below bind globals as locals; never passed.
+def _fast_distance(p1, p2, diag=False, euclidean=True, _sqrt=_sqrt):
     dx = p1.x - p2.x  # use attribute access – works on Point, tuple (namedtuple), and Unit
     dy = p1.y - p2.y
     if diag:
@@ -195,6 +338,12 @@ Level.distance = _fast_distance
 # =========================================================================
 # Original iterates every unit and computes sqrt distance.  We add a cheap
 # axis-aligned bbox check first to skip most units.
+#
+# numpy is available (tcod depends on it; PATCH 1 reads tcod_map.fov), but a
+# vectorised scan would need unit positions mirrored into arrays.  Units are
+# moved by direct x/y assignment all over the base game, so those arrays
+# can't be kept in sync from here, and rebuilding them per call costs more
+# than this loop over a level's few hundred units.
 # =========================================================================
 
 def _fast_get_units_in_ball(self, center, radius, diag=False):
@@ -202,24 +351,29 @@ def _fast_get_units_in_ball(self, center, radius, diag=False):
     cy = center.y
     r = radius
     result = []
-    sqrt = _sqrt
-    for u in self.units:
-        ur = u.radius
-        effective_r = r + ur
-        dx = u.x - cx
-        dy = u.y - cy
-        # Cheap bbox check
-        if dx > effective_r or dx < -effective_r or dy > effective_r or dy < -effective_r:
-            continue
-        # Precise check
-        if diag:
-            adx = dx if dx >= 0 else -dx
-            ady = dy if dy >= 0 else -dy
-            d = adx if adx > ady else ady
-        else:
-            d = sqrt(dx * dx + dy * dy)
-        if d <= effective_r:
-            result.append(u)
+    append = result.append
+    # Branch on diag once, outside the loop.  Both loops reject on the
+    # cheap bbox first; the euclidean test compares squared distances so
+    # no sqrt is ever taken.
+    if diag:
+        for u in self.units:
+            effective_r = r + u.radius
+            dx = u.x - cx
+            dy = u.y - cy
+            # Chebyshev distance is exactly the bbox test
+            if -effective_r <= dx <= effective_r and -effective_r <= dy <= effective_r:
+                append(u)
+    else:
+        for u in self.units:
+            effective_r = r + u.radius
+            dx = u.x - cx
+            dy = u.y - cy
+            # Cheap bbox check
+            if dx > effective_r or dx < -effective_r or dy > effective_r or dy < -effective_r:
+                continue
+            # Precise check
+            if dx * dx + dy * dy <= effective_r * effective_r:
+                append(u)
     return result
 
 
@@ -236,25 +390,27 @@ Level.Level.get_units_in_ball = _fast_get_units_in_ball
 # We cache the result once per frame.
 # =========================================================================
 
-_dismiss_cache = {}
+_dismiss_has_enemies = True
 _dismiss_cache_key = None
 
 def _fast_try_dismiss_ally(self):
-    global _dismiss_cache, _dismiss_cache_key
+    global _dismiss_has_enemies, _dismiss_cache_key
     lvl = self.level
-    if not lvl.player_unit:
+    player = lvl.player_unit
+    if not player:
         return
-    cache_key = (id(lvl), lvl.turn_no, lvl.frame_start_time)
+    cache_key = _frame_ids.get(id(lvl))
+    if cache_key is None:
+        cache_key = (id(lvl), lvl.turn_no, lvl.frame_start_time)
     if cache_key != _dismiss_cache_key:
         _dismiss_cache_key = cache_key
-        player = lvl.player_unit
-        _dismiss_cache['has_enemies'] = any(are_hostile(player, u) for u in lvl.units)
-    if not _dismiss_cache['has_enemies']:
-        if not self.is_player_controlled:
-            import random
-            if random.random() < .2:
-                self.kill(trigger_death_event=False)
-                lvl.show_effect(self.x, self.y, Level.Tags.Translocation)
+        _dismiss_has_enemies = any(are_hostile(player, u) for u in lvl.units)
+    # Common case: enemies remain, so there is nothing to roll for
+    if _dismiss_has_enemies or self.is_player_controlled:
+        return
+    if random.random() < .2:
+        self.kill(trigger_death_event=False)
+        lvl.show_effect(self.x, self.y, Level.Tags.Translocation)
 
 
 _log("performance_boost: patching Unit.try_dismiss_ally  (cached hostility check)")
@@ -262,21 +418,16 @@ Level.Unit.try_dismiss_ally = _fast_try_dismiss_ally
 
 
 # =========================================================================
-# PATCH 5 – Faster EventHandler.raise_event (avoid list copy when safe)
+# PATCH 5 – EventHandler.raise_event (list copy intentionally kept)
 # =========================================================================
-# The original does list(...) on EVERY raise_event to snapshot handlers.
-# We add a dirty flag so the copy only happens after a mutation.
+# The original does list(...) on EVERY raise_event to snapshot handlers, and
+# so do we: handlers register and unregister while an event is being
+# dispatched, and the copy keeps that from changing the list mid-iteration.
+# This version only binds the per-type handler dict once.
 # =========================================================================
 
-_orig_EventHandler_init = Level.EventHandler.__init__
-
-def _new_EventHandler_init(self):
-    _orig_EventHandler_init(self)
-    self._dirty = True  # start dirty so first raise does the snapshot
-
 def _fast_raise_event(self, event, entity=None):
-    evt_type = type(event)
-    handlers_by_entity = self._handlers[evt_type]
+    handlers_by_entity = self._handlers[type(event)]
     if entity:
         entity_handlers = handlers_by_entity.get(entity)
         if entity_handlers:
@@ -288,7 +439,6 @@ def _fast_raise_event(self, event, entity=None):
             handler(event)
 
 _log("performance_boost: patching EventHandler.raise_event  (fast path)")
-Level.EventHandler.__init__ = _new_EventHandler_init
 Level.EventHandler.raise_event = _fast_raise_event
 
 
@@ -302,7 +452,7 @@ Level.EventHandler.raise_event = _fast_raise_event
 
 _ceil = math.ceil
 
-def _fast_unit_get_stat(self, base, spell, attr):
+def _fast_unit_get_stat(self, base, spell, attr, _ceil=_ceil, _int=int):
     # Short-circuit: range for self-targeted / melee spells never changes
     if attr == 'range':
         sr = spell.range
@@ -344,20 +494,20 @@ def _fast_unit_get_stat(self, base, spell, attr):
 
     gb = self.global_bonuses
     if gb:
-        v = gb.get(attr, 0)
+        v = gb.get(attr)
         if v:
             bonus_total += v
 
     gbp = self.global_bonuses_pct
     if gbp:
-        v = gbp.get(attr, 0)
+        v = gbp.get(attr)
         if v:
             pct_total += v
 
-    isint = type(base) == int
     value = base * (pct_total / 100.0) + bonus_total
-    if isint:
-        value = int(_ceil(value))
+    # Exact type check: bool bases (and int subclasses) stay floats as before
+    if type(base) is int:
+        value = _int(_ceil(value))
 
     if value < 0:
         value = 0
@@ -372,42 +522,69 @@ Level.Unit.get_stat = _fast_unit_get_stat
 
 
 # =========================================================================
-# PATCH 7 – Faster get_points_in_ball with pre-filtered rect
+# PATCH 7 – Faster get_points_in_ball with per-radius offset tables
 # =========================================================================
-# Avoids creating Point objects for cells outside the radius by using
-# squared distance comparison (no sqrt needed for circle tests).
+# The set of (dx, dy) offsets inside a ball depends only on the radius and
+# the metric, so we build it once per (radius, diag) and afterwards just
+# walk the table, clipping to the map.  Offsets are stored in the same
+# x-major order the original loops produced.
 # =========================================================================
 
-def _fast_get_points_in_ball(self, x, y, radius, diag=False):
-    rounded_radius = int(math.ceil(radius))
-    xmin = max(x - rounded_radius, 0)
-    xmax = min(x + rounded_radius, self.width - 1)
-    ymin = max(y - rounded_radius, 0)
-    ymax = min(y + rounded_radius, self.height - 1)
+_ball_offsets = {}
 
-    if diag:
-        # Chebyshev distance
-        for cx in range(xmin, xmax + 1):
-            for cy in range(ymin, ymax + 1):
-                dx = cx - x
-                dy = cy - y
-                adx = dx if dx >= 0 else -dx
-                ady = dy if dy >= 0 else -dy
-                if (adx if adx > ady else ady) <= radius:
-                    yield Point(cx, cy)
+def _offsets_for(radius, diag):
+    """Return the cached tuple of (dx, dy) offsets within radius."""
+    key = (radius, diag)
+    offsets = _ball_offsets.get(key)
+    if offsets is None:
+        rounded_radius = int(math.ceil(radius))
+        span = range(-rounded_radius, rounded_radius + 1)
+        if diag:
+            # Chebyshev distance
+            offsets = tuple((dx, dy) for dx in span for dy in span
+                            if max(abs(dx), abs(dy)) <= radius)
+        else:
+            # Euclidean – compare squared to avoid sqrt
+            r_sq = radius * radius
+            offsets = tuple((dx, dy) for dx in span for dy in span
+                            if dx * dx + dy * dy <= r_sq)
+        _ball_offsets[key] = offsets
+    return offsets
+
+# Points are immutable namedtuples, so one shared instance per tile is
+# indistinguishable from a fresh one.  Keep a grid of them per map size and
+# hand those out instead of allocating a Point for every cell of every ball.
+_point_grids = {}
+
+def _points_for(w, h):
+    """Return the cached grid of Points for a w x h map, indexed [x][y]."""
+    grid = _point_grids.get((w, h))
+    if grid is None:
+        grid = tuple(tuple(Point(x, y) for y in range(h)) for x in range(w))
+        _point_grids[(w, h)] = grid
+    return grid
+
+def _fast_get_points_in_ball(self, x, y, radius, diag=False,
+                             _offsets_for=_offsets_for, _points_for=_points_for, _ceil=_ceil):
+    offsets = _offsets_for(radius, diag)
+    rounded_radius = int(_ceil(radius))
+    w = self.width
+    h = self.height
+    points = _points_for(w, h)
+    if (x - rounded_radius >= 0 and y - rounded_radius >= 0
+            and x + rounded_radius < w and y + rounded_radius < h):
+        # Ball lies entirely inside the map – no clipping needed
+        for dx, dy in offsets:
+            yield points[x + dx][y + dy]
     else:
-        # Euclidean – compare squared to avoid sqrt
-        r_sq = radius * radius
-        for cx in range(xmin, xmax + 1):
-            dx = cx - x
-            dx_sq = dx * dx
-            for cy in range(ymin, ymax + 1):
-                dy = cy - y
-                if dx_sq + dy * dy <= r_sq:
-                    yield Point(cx, cy)
-
-
-_log("performance_boost: patching Level.get_points_in_ball  (squared distance)")
+        for dx, dy in offsets:
+            cx = x + dx
+            cy = y + dy
+            if 0 <= cx < w and 0 <= cy < h:
+                yield points[cx][cy]
+
+
+_log("performance_boost: patching Level.get_points_in_ball  (offset tables)")
 Level.Level.get_points_in_ball = _fast_get_points_in_ball
 
 
@@ -419,22 +596,8 @@ Level.Level.get_points_in_ball = _fast_get_points_in_ball
 # processed per frame in turbo mode, reducing total frame overhead.
 # =========================================================================
 
-_orig_iter_frame = Level.Level.iter_frame
-
-def _fast_iter_frame(self, mark_turn_end=False):
-    gen = _orig_iter_frame(self, mark_turn_end)
-    for val in gen:
-        # Dynamically widen the advance window when visual_mode is off
-        # (turbo/fast-forward).  The game sets visual_mode = False during
-        # super-turbo already; we just give it more time per frame.
-        if not Level.visual_mode:
-            self.frame_start_time = time.time()  # Reset clock to prevent early yield
-        yield val
-
-
-# We don't patch iter_frame directly because it's a generator stored in
-# level.turns at construction time.  Instead, we bump MAX_ADVANCE_TIME
-# from 20ms to 100ms which helps turbo substantially.
+# Rather than resetting frame_start_time from an iter_frame wrapper, we
+# bump MAX_ADVANCE_TIME from 20ms to 100ms which helps turbo substantially.
 _log("performance_boost: bumping MAX_ADVANCE_TIME 0.02 -> 0.10  (turbo boost)")
 Level.MAX_ADVANCE_TIME = 0.10
 
@@ -446,9 +609,13 @@ Level.MAX_ADVANCE_TIME = 0.10
 # per unit per advance.  We speed up has_buff with a type check shortcut.
 # =========================================================================
 
+_Stun = Level.Stun
+
 def _fast_is_stunned(self):
     for b in self.buffs:
-        if b.__class__.__name__ == 'Stun' or isinstance(b, Level.Stun):
+        # isinstance covers Stun and its subclasses; the name test only
+        # matters for the rare Stun class that is not Level.Stun
+        if isinstance(b, _Stun) or b.__class__.__name__ == 'Stun':
             return True
     return False
 
@@ -16,17 +16,28 @@
 # - Abandon Run:
 #     A          -> confirmation -> LOSS -> delete save & return to Title
 #     Shift + A  -> instant LOSS -> delete save & return to Title
-# - Logs to mods/quick_restart/quick_restart.log
+# - Logs to mods/quick_restart/quick_restart.log (per-action trace lines
+#   only when the QR_DEBUG environment variable is set; errors always)
 
-import sys, os, pygame
+import atexit, sys, os, pygame
 
 LOG_PATH = os.path.join(os.path.dirname(__file__), "quick_restart.log")
 
+# Per-action trace logging; failures are logged regardless.
+_QR_DEBUG = bool(os.environ.get("QR_DEBUG"))
+
+try:
+    _log_file = open(LOG_PATH, "a", encoding="utf-8", buffering=1)
+    atexit.register(_log_file.close)
+except Exception:
+    _log_file = None
+
 
 def _log(msg):
+    if _log_file is None:
+        return
     try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(msg + "\n")
+        _log_file.write(msg + "\n")
     except Exception:
         pass
 
@@ -42,24 +53,36 @@ if game is None:
 
 import SteamAdapter
 import Game as GameModule
-import Mutators  # needed to re-roll for Mutated mode
 
 PyGameView = getattr(game, "PyGameView", None)
 if PyGameView is None:
     _log("quick_restart: ERROR: PyGameView not found")
     raise RuntimeError("PyGameView not found; game version mismatch?")
 
+# Game states and keys, resolved once instead of on every input tick
+_STATE_OPTIONS = game.STATE_OPTIONS
+_STATE_CONFIRM = game.STATE_CONFIRM
+_STATE_LEVEL = getattr(game, "STATE_LEVEL", None)
+_STATE_TITLE = getattr(game, "STATE_TITLE", None)
+_KEYDOWN = pygame.KEYDOWN
+_KMOD_SHIFT = pygame.KMOD_SHIFT
+_K_R = pygame.K_r
+_K_A = pygame.K_a
+
 # ---------- shared helpers ----------
 
 
 def _qr_record_loss(self):
     """Reset streak and increment losses (same as death/abandon)."""
     try:
-        s = SteamAdapter.get_stat("s")
+        # The old streak is only needed for the trace line
+        if _QR_DEBUG:
+            s = SteamAdapter.get_stat("s")
         l = SteamAdapter.get_stat("l")
         SteamAdapter.set_stat("s", 0)
         SteamAdapter.set_stat("l", l + 1)
-        _log(f"loss recorded s {s}->0, l {l}->{l+1}")
+        if _QR_DEBUG:
+            _log(f"loss recorded s {s}->0, l {l}->{l+1}")
     except Exception as e:
         _log(f"loss record failed: {e!r}")
 
@@ -69,12 +92,14 @@ def _qr_finalize_as_defeat(self, reason):
     so that log-analysis tools count this run properly instead of as a quit."""
     try:
         level = self.game.cur_level
-        if hasattr(level, "combat_log") and level.combat_log:
-            level.combat_log.debug(
+        combat_log = getattr(level, "combat_log", None)
+        if combat_log:
+            combat_log.debug(
                 "[Wizard:wizard] killed by [Quick_Restart:enemy] %s" % reason
             )
         self.game.finalize_save(victory=False)
-        _log("finalize_as_defeat(%s) ok" % reason)
+        if _QR_DEBUG:
+            _log("finalize_as_defeat(%s) ok" % reason)
     except Exception as e:
         _log(
             "finalize_as_defeat(%s) failed: %r; falling back to abort_game"
@@ -89,13 +114,15 @@ def _qr_finalize_as_defeat(self, reason):
 def _qr_skip_intro_to_level(self):
     """Skip story panel and jump to level."""
     try:
+        # Plain assignments: on builds without these attributes they are
+        # just unused extras on the view
         self.message = None
-        if hasattr(self, "next_message"):
-            self.next_message = None
-        if hasattr(self, "center_message"):
-            self.center_message = False
-        self.state = getattr(game, "STATE_LEVEL", self.state)
-        _log("skipped intro: set state to STATE_LEVEL")
+        self.next_message = None
+        self.center_message = False
+        if _STATE_LEVEL is not None:
+            self.state = _STATE_LEVEL
+        if _QR_DEBUG:
+            _log("skipped intro: set state to STATE_LEVEL")
     except Exception as e:
         _log(f"skip-intro block failed: {e!r}")
 
@@ -117,8 +144,12 @@ def _qr_restart_with_same_params(self):
     # Determine mutators for restart
     if trial_name == "MUTATED_RUN":
         try:
+            # Imported here: only Mutated restarts need it
+            import Mutators
+
             mutators_arg = Mutators.get_random_mutators()
-            _log("mutators re-rolled for MUTATED_RUN")
+            if _QR_DEBUG:
+                _log("mutators re-rolled for MUTATED_RUN")
         except Exception as e:
             _log(
                 f"get_random_mutators() failed: {e!r}; falling back to previous mutators"
@@ -143,11 +174,12 @@ def _qr_restart_with_same_params(self):
 
     try:
         self.new_game(mutators=mutators_arg, trial_name=trial_name, seed=seed)
-        _log(
-            "new_game("
-            f"mutators={'re-rolled' if trial_name=='MUTATED_RUN' else ('y' if mutators else 'n')}, "
-            f"trial={trial_name}, seed={seed})"
-        )
+        if _QR_DEBUG:
+            _log(
+                "new_game("
+                f"mutators={'re-rolled' if trial_name=='MUTATED_RUN' else ('y' if mutators else 'n')}, "
+                f"trial={trial_name}, seed={seed})"
+            )
     except Exception as e:
         _log(f"new_game() failed: {e!r}")
         return
@@ -157,12 +189,13 @@ def _qr_restart_with_same_params(self):
 
 def _qr_open_restart_prompt(self):
     self.play_sound("menu_confirm")
-    self.state = game.STATE_CONFIRM
+    self.state = _STATE_CONFIRM
     self.confirm_text = "Quick restart this run with the same mode?"
     self.confirm_yes = self._qr_confirm_restart
     self.confirm_no = self._qr_abort_to_options
     self.examine_target = False
-    _log("prompt opened: restart")
+    if _QR_DEBUG:
+        _log("prompt opened: restart")
 
 
 def _qr_confirm_restart(self):
@@ -187,20 +220,23 @@ def _qr_abandon_to_title(self):
 
     # Ensure we're at title
     try:
-        self.state = getattr(game, "STATE_TITLE", self.state)
-        _log("abandon: set state to STATE_TITLE")
+        if _STATE_TITLE is not None:
+            self.state = _STATE_TITLE
+        if _QR_DEBUG:
+            _log("abandon: set state to STATE_TITLE")
     except Exception as e:
         _log(f"abandon: set title failed: {e!r}")
 
 
 def _qr_open_abandon_prompt(self):
     self.play_sound("menu_confirm")
-    self.state = game.STATE_CONFIRM
+    self.state = _STATE_CONFIRM
     self.confirm_text = "Abandon this run and return to Title?"
     self.confirm_yes = self._qr_confirm_abandon
     self.confirm_no = self._qr_abort_to_options
     self.examine_target = False
-    _log("prompt opened: abandon")
+    if _QR_DEBUG:
+        _log("prompt opened: abandon")
 
 
 def _qr_confirm_abandon(self):
@@ -212,8 +248,9 @@ def _qr_confirm_abandon(self):
 
 def _qr_abort_to_options(self):
     self.play_sound("menu_confirm")
-    self.state = game.STATE_OPTIONS
-    _log("confirm aborted -> options")
+    self.state = _STATE_OPTIONS
+    if _QR_DEBUG:
+        _log("confirm aborted -> options")
 
 
 # Attach helpers to class
@@ -229,57 +266,68 @@ _orig_draw_options_menu = PyGameView.draw_options_menu
 _orig_process_options_input = PyGameView.process_options_input
 
 
-def _qr_draw_options_menu(self):
-    _orig_draw_options_menu(self)
+_HINT_RESTART = "Quick Restart: R = confirm, Shift+R = instant (Mutated re-rolls)"
+_HINT_ABANDON = "Abandon Run:  A = confirm, Shift+A = instant (deletes run, returns to Title)"
+
+
+def _qr_draw_options_menu(
+    self, _orig=_orig_draw_options_menu, _STATE_OPTIONS=_STATE_OPTIONS
+):
+    _orig(self)
     # Add two non-interactive hint lines at the bottom of Options
-    if getattr(self, "game", None) and self.state == game.STATE_OPTIONS:
+    if getattr(self, "game", None) and self.state == _STATE_OPTIONS:
         try:
-            base_y = self.screen.get_height() - self.linesize * 3
-            x = self.screen.get_width() // 2 - 320
+            screen = self.screen
+            base_y = screen.get_height() - self.linesize * 3
+            x = screen.get_width() // 2 - 320
+            self.draw_string(_HINT_RESTART, screen, x, base_y, content_width=640)
             self.draw_string(
-                "Quick Restart: R = confirm, Shift+R = instant (Mutated re-rolls)",
-                self.screen,
-                x,
-                base_y,
-                content_width=640,
-            )
-            self.draw_string(
-                "Abandon Run:  A = confirm, Shift+A = instant (deletes run, returns to Title)",
-                self.screen,
-                x,
-                base_y + self.linesize,
-                content_width=640,
+                _HINT_ABANDON, screen, x, base_y + self.linesize, content_width=640
             )
         except Exception as e:
             _log(f"draw hints failed: {e!r}")
 
 
-def _qr_process_options_input(self):
-    if self.state == game.STATE_OPTIONS:
-        # Handle R / Shift+R (Quick Restart)
-        for evt in [e for e in self.events if e.type == pygame.KEYDOWN]:
-            if evt.key == pygame.K_r:
-                if pygame.key.get_mods() & pygame.KMOD_SHIFT:
-                    _log("Shift+R -> instant restart")
+def _qr_process_options_input(
+    self,
+    _orig=_orig_process_options_input,
+    _STATE_OPTIONS=_STATE_OPTIONS,
+    _KEYDOWN=_KEYDOWN,
+    _K_R=_K_R,
+    _K_A=_K_A,
+    _KMOD_SHIFT=_KMOD_SHIFT,
+):
+    # Most menu frames carry no events at all; skip the scan for those
+    if self.events and self.state == _STATE_OPTIONS:
+        # One pass over the frame's events: R / Shift+R (Quick Restart) and
+        # A / Shift+A (Abandon to Title), whichever was pressed first
+        for evt in self.events:
+            if evt.type != _KEYDOWN:
+                continue
+            key = evt.key
+            if key == _K_R:
+                if pygame.key.get_mods() & _KMOD_SHIFT:
+                    if _QR_DEBUG:
+                        _log("Shift+R -> instant restart")
                     _qr_record_loss(self)
                     _qr_restart_with_same_params(self)
                 else:
-                    _log("R -> prompt (restart)")
+                    if _QR_DEBUG:
+                        _log("R -> prompt (restart)")
                     self._qr_open_restart_prompt()
                 return
-
-        # Handle A / Shift+A (Abandon to Title)
-        for evt in [e for e in self.events if e.type == pygame.KEYDOWN]:
-            if evt.key == pygame.K_a:
-                if pygame.key.get_mods() & pygame.KMOD_SHIFT:
-                    _log("Shift+A -> instant abandon")
+            if key == _K_A:
+                if pygame.key.get_mods() & _KMOD_SHIFT:
+                    if _QR_DEBUG:
+                        _log("Shift+A -> instant abandon")
                     _qr_abandon_to_title(self)
                 else:
-                    _log("A -> prompt (abandon)")
+                    if _QR_DEBUG:
+                        _log("A -> prompt (abandon)")
                     self._qr_open_abandon_prompt()
                 return
 
-    _orig_process_options_input(self)
+    _orig(self)
 
 
 # Install wrappers
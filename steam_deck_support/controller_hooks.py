@@ -60,6 +60,14 @@ def try_integrate_controller():
         print("[Deck Panels] Could not import controller config, skipping")
         return False
 
+    # Back + combo buttons, masked out of pressed_edges while Back is held
+    suppress_mask = (
+        (1 << XboxButtons.BACK)
+        | (1 << XboxButtons.LB)
+        | (1 << XboxButtons.RB)
+        | (1 << XboxButtons.Y)
+    )
+
     # Get the injection module to wrap inject_controller_events
     try:
         import mods.controller_support.injection as injection_mod
@@ -105,7 +113,7 @@ def try_integrate_controller():
 
         # Poll once per frame
         try:
-            ctrl.poll(frameno)
+            ctrl.poll(frameno, view.events)
         except Exception:
             pass
 
@@ -164,15 +172,12 @@ def try_integrate_controller():
         # buttons (LB, RB, Y) so their normal actions (Help, crafting,
         # spell browse, character sheet) don't fire in the original inject.
         if ctrl.button_held(XboxButtons.BACK):
-            suppress = [XboxButtons.BACK, XboxButtons.LB, XboxButtons.RB, XboxButtons.Y]
-            saved = {btn: ctrl.prev_buttons.get(btn, False) for btn in suppress}
-            for btn in suppress:
-                ctrl.prev_buttons[btn] = True  # makes button_just_pressed → False
+            saved = ctrl.pressed_edges
+            ctrl.pressed_edges &= ~suppress_mask  # makes button_just_pressed → False
             try:
                 return _inject_and_check_browse(view)
             finally:
-                for btn in suppress:
-                    ctrl.prev_buttons[btn] = saved[btn]
+                ctrl.pressed_edges = saved
 
         # Fall through to normal injection
         return _inject_and_check_browse(view)